@@ -1,16 +1,92 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, current_app, g, request
+from flask.json.provider import JSONProvider
 from abc import ABC, abstractmethod
 from datetime import datetime
+from enum import IntEnum
 import threading
+import collections
+import logging
+import logging.handlers
+import math
 import queue
+import re
+import signal
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import json
 import requests
-from typing import List, Dict, Any, Optional, Callable
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, DefaultDict, Deque, FrozenSet, Tuple, Any, Optional, Callable, Iterator
 import time
+import orjson
+from waitress.server import create_server
+from waitress.wasyncore import close_all
+
+# ==================== JSON SERIALIZATION ====================
+
+_WIDE_DIGITS_BYTES = re.compile(rb"\d{20}")
+_WIDE_DIGITS_STR = re.compile(r"\d{20}")
+
+class OrJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (used by jsonify and request.get_json)"""
+    option = orjson.OPT_NON_STR_KEYS
+    # Same switches as Flask's DefaultJSONProvider, but off by default: no key sorting, no indentation
+    sort_keys = False
+    compact = True
+
+    def options(self) -> int:
+        """orjson option flags for the current sort_keys/compact settings"""
+        option = self.option
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if not self.compact:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj).decode()
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=self.options())
+        except orjson.JSONEncodeError:
+            # Beyond orjson's limits (nesting deeper than 254, integers wider than 64 bits): use the stdlib encoder
+            return json.dumps(
+                obj, ensure_ascii=False, sort_keys=self.sort_keys,
+                indent=None if self.compact else 2, separators=(",", ":") if self.compact else None
+            ).encode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        # orjson turns integers wider than 64 bits into floats; a run of 20+ digits might be one, so let the stdlib parse it
+        wide = _WIDE_DIGITS_BYTES.search(s) if isinstance(s, bytes) else _WIDE_DIGITS_STR.search(s)
+        if wide:
+            return json.loads(s)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Build the body straight from orjson's bytes instead of encoding a str again
+        obj = self._prepare_response_obj(args, kwargs)
+        return Response(self.dumps_bytes(obj), mimetype="application/json")
+
+def json_response(payload: Any) -> Response:
+    """JSON response encoded straight to bytes by the app's OrJSONProvider, skipping jsonify's argument handling"""
+    provider: OrJSONProvider = current_app.json  # type: ignore[assignment]
+    return current_app.response_class(provider.dumps_bytes(payload), mimetype="application/json")
+
+def request_now_iso() -> str:
+    """ISO timestamp for the current request, computed on first use and shared by later callers"""
+    if "now_iso" not in g:
+        g.now_iso = datetime.now().isoformat()
+    return g.now_iso
+
+# Worker threads per service in the waitress WSGI server
+WSGI_THREADS = 8
 
 # ==================== SHARED MODELS AND INTERFACES ====================
 
 class User:
+    __slots__ = ('user_id', 'name', 'email', 'user_type')
+
     def __init__(self, user_id: str, name: str, email: str, user_type: str):
         self.user_id = user_id
         self.name = name
@@ -18,6 +94,8 @@ class User:
         self.user_type = user_type
 
 class Course:
+    __slots__ = ('course_id', 'name', 'instructor', 'capacity', 'enrolled', 'prerequisites', 'schedule', 'utilization')
+
     def __init__(self, course_id: str, name: str, instructor: str, capacity: int, 
                  enrolled: int = 0, prerequisites: Optional[List[str]] = None):
         self.course_id = course_id
@@ -27,93 +105,183 @@ class Course:
         self.enrolled = enrolled
         self.prerequisites = prerequisites or []
         self.schedule = {"days": ["Mon", "Wed"], "time": "10:00-11:30", "location": "Room 101"}
+        # Enrollment percentage, kept in step with enrolled so DTOs don't recompute it
+        self.utilization = self._compute_utilization()
+
+    def _compute_utilization(self) -> float:
+        return round((self.enrolled / self.capacity) * 100, 2)
+
+    def enroll(self):
+        self.enrolled += 1
+        self.utilization = self._compute_utilization()
+
+    def unenroll(self):
+        self.enrolled -= 1
+        self.utilization = self._compute_utilization()
+
+class EventType(IntEnum):
+    STUDENT_ENROLLED = 1
+    STUDENT_DROPPED = 2
+    GRADE_SUBMITTED = 3
+    COURSE_CREATED = 4
+    SYSTEM_CONFIG_UPDATED = 5
 
 class Event:
-    def __init__(self, event_type: str, data: Dict[str, Any]):
+    __slots__ = ('event_type', 'data', 'timestamp')
+
+    def __init__(self, event_type: EventType, data: Dict[str, Any]):
         self.event_type = event_type
         self.data = data
-        self.timestamp = datetime.now()
+        # Wall-clock nanoseconds; cheaper than a datetime and only formatted where a string is needed
+        self.timestamp = time.time_ns()
 
 # ==================== DESIGN PATTERN 1: OBSERVER PATTERN (EVENT-DRIVEN) ====================
 
 class EventBus:
-    """Singleton Event Bus for microservices communication"""
+    """Singleton Event Bus for microservices communication.
+
+    The pending-event queue is bounded: once MAX_PENDING_EVENTS are waiting, publishing
+    drops the oldest pending events (with a warning) rather than growing without limit
+    or blocking the request thread.
+    """
+    MAX_PENDING_EVENTS = 10000
     _instance = None
     _lock = threading.Lock()
     # Type declarations to satisfy static checkers
-    subscribers: Dict[str, List[Callable]]
-    event_queue: queue.Queue
+    subscribers: DefaultDict[EventType, Tuple[Callable, ...]]
+    event_queue: Deque[Event]
+    _event_ready: threading.Event
+    _executor: ThreadPoolExecutor
     
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance.subscribers = {}
-                    cls._instance.event_queue = queue.Queue()
-                    cls._instance._start_event_processor()
+                    instance = super().__new__(cls)
+                    instance._init_state()
+                    instance._start_event_processor()
+                    cls._instance = instance
         return cls._instance
+
+    def _init_state(self):
+        # Copy-on-write tuples: the consumer iterates whatever tuple is bound without locking
+        self.subscribers = collections.defaultdict(tuple)
+        # Single consumer: deque append/popleft are atomic, the Event only wakes the consumer
+        self.event_queue = collections.deque(maxlen=self.MAX_PENDING_EVENTS)
+        self._event_ready = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="event-bus")
     
-    def subscribe(self, event_type: str, callback):
-        if event_type not in self.subscribers:
-            self.subscribers[event_type] = []
-        self.subscribers[event_type].append(callback)
+    def subscribe(self, event_type: EventType, callback):
+        with self._lock:
+            self.subscribers[event_type] = self.subscribers[event_type] + (callback,)
     
     def publish(self, event: Event):
-        self.event_queue.put(event)
+        if len(self.event_queue) >= self.MAX_PENDING_EVENTS:
+            self._warn_dropped(1)
+        self.event_queue.append(event)
+        self._event_ready.set()
+
+    def publish_many(self, events: List[Event]):
+        overflow = len(self.event_queue) + len(events) - self.MAX_PENDING_EVENTS
+        if overflow > 0:
+            self._warn_dropped(overflow)
+        self.event_queue.extend(events)
+        self._event_ready.set()
+
+    def _warn_dropped(self, count: int):
+        logging.getLogger("nexus.event_bus").warning(
+            f"Event queue full ({self.MAX_PENDING_EVENTS} pending): dropping {count} oldest event(s)")
     
     def _start_event_processor(self):
         def process_events():
+            # Bind everything the drain loop touches once; subscribe() mutates this same dict in place
+            event_queue = self.event_queue
+            event_ready = self._event_ready
+            subscribers = self.subscribers
+            submit = self._executor.submit
+            dispatch = self._dispatch
             while True:
-                try:
-                    event = self.event_queue.get(timeout=1)
-                    if event.event_type in self.subscribers:
-                        for callback in self.subscribers[event.event_type]:
-                            try:
-                                callback(event)
-                            except Exception as e:
-                                print(f"Error processing event {event.event_type}: {e}")
-                    self.event_queue.task_done()
-                except queue.Empty:
-                    continue
+                event_ready.wait(timeout=1)
+                event_ready.clear()
+                # Drain the whole backlog per wake-up, e.g. a publish_many batch from submit_grades
+                while event_queue:
+                    try:
+                        event = event_queue.popleft()
+                    except IndexError:
+                        break
+                    callbacks = subscribers.get(event.event_type, ())
+                    if not callbacks:
+                        continue
+                    # Subscribers of one event run concurrently; waiting on them keeps events in publish order
+                    try:
+                        wait([submit(dispatch, callback, event) for callback in callbacks])
+                    except RuntimeError:
+                        return  # Executor refuses new work once the interpreter is shutting down
         
         thread = threading.Thread(target=process_events, daemon=True)
         thread.start()
 
+    @staticmethod
+    def _dispatch(callback: Callable, event: Event):
+        try:
+            callback(event)
+        except Exception as e:
+            print(f"Error processing event {event.event_type.name}: {e}")
+
 # ==================== DESIGN PATTERN 2: FACTORY METHOD PATTERN ====================
 
 class DTOFactory(ABC):
+    __slots__ = ('_dispatch',)
+
+    def __init__(self):
+        # Exact-type dispatch: one dict lookup per call instead of an isinstance chain
+        self._dispatch = self._build_dispatch()
+
     @abstractmethod
-    def create_response_dto(self, data: Any) -> Dict[str, Any]:
+    def _build_dispatch(self) -> Dict[type, Callable[[Any], Dict[str, Any]]]:
         pass
 
-class StudentDTOFactory(DTOFactory):
     def create_response_dto(self, data: Any) -> Dict[str, Any]:
-        if isinstance(data, Course):
-            return {
-                "course_id": data.course_id,
-                "name": data.name,
-                "instructor": data.instructor,
-                "available_seats": data.capacity - data.enrolled,
-                "schedule": data.schedule,
-                "prerequisites": data.prerequisites,
-                "can_enroll": True  # Student-specific field
-            }
-        elif isinstance(data, list):  # List of courses
-            return {"courses": [self.create_response_dto(course) for course in data]}
-        return {"error": "Unsupported data type"}
+        handler = self._dispatch.get(type(data))
+        return handler(data) if handler else {"error": "Unsupported data type"}
+
+class StudentDTOFactory(DTOFactory):
+    __slots__ = ()
+
+    def _build_dispatch(self) -> Dict[type, Callable[[Any], Dict[str, Any]]]:
+        return {Course: self._from_course, list: self._from_list}
+
+    def _from_course(self, data: Course) -> Dict[str, Any]:
+        return {
+            "course_id": data.course_id,
+            "name": data.name,
+            "instructor": data.instructor,
+            "available_seats": data.capacity - data.enrolled,
+            "schedule": data.schedule,
+            "prerequisites": data.prerequisites,
+            "can_enroll": True  # Student-specific field
+        }
+
+    def _from_list(self, data: List[Course]) -> Dict[str, Any]:  # List of courses
+        return {"courses": [self.create_response_dto(course) for course in data]}
 
 class FacultyDTOFactory(DTOFactory):
-    def create_response_dto(self, data: Any) -> Dict[str, Any]:
-        if isinstance(data, Course):
-            return {
-                "course_id": data.course_id,
-                "name": data.name,
-                "enrollment_count": data.enrolled,
-                "capacity": data.capacity,
-                "enrollment_percentage": round((data.enrolled / data.capacity) * 100, 2)
-            }
-        elif isinstance(data, dict) and "students" in data:  # Roster data
+    __slots__ = ()
+
+    def _build_dispatch(self) -> Dict[type, Callable[[Any], Dict[str, Any]]]:
+        return {Course: self._from_course, dict: self._from_dict}
+
+    def _from_course(self, data: Course) -> Dict[str, Any]:
+        return {
+            "course_id": data.course_id,
+            "name": data.name,
+            "enrollment_count": data.enrolled,
+            "capacity": data.capacity,
+            "enrollment_percentage": data.utilization
+        }
+
+    def _from_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if "students" in data:  # Roster data
             return {
                 "course_id": data.get("course_id"),
                 "students": data["students"],
@@ -122,37 +290,63 @@ class FacultyDTOFactory(DTOFactory):
         return {"error": "Unsupported data type"}
 
 class AdminDTOFactory(DTOFactory):
-    def create_response_dto(self, data: Any) -> Dict[str, Any]:
-        if isinstance(data, Course):
-            return {
-                "course_id": data.course_id,
-                "name": data.name,
-                "instructor": data.instructor,
-                "capacity": data.capacity,
-                "enrolled": data.enrolled,
-                "utilization_rate": round((data.enrolled / data.capacity) * 100, 2),
-                "schedule": data.schedule,
-                "prerequisites": data.prerequisites,
-                "status": "active"
-            }
-        elif isinstance(data, dict) and "report_type" in data:  # Report data
+    __slots__ = ()
+
+    def _build_dispatch(self) -> Dict[type, Callable[[Any], Dict[str, Any]]]:
+        return {Course: self._from_course, dict: self._from_dict}
+
+    def _from_course(self, data: Course) -> Dict[str, Any]:
+        return {
+            "course_id": data.course_id,
+            "name": data.name,
+            "instructor": data.instructor,
+            "capacity": data.capacity,
+            "enrolled": data.enrolled,
+            "utilization_rate": data.utilization,
+            "schedule": data.schedule,
+            "prerequisites": data.prerequisites,
+            "status": "active"
+        }
+
+    def _from_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if "report_type" in data:  # Report data
             return {
                 "report_type": data["report_type"],
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": data.get("generated_at") or datetime.now().isoformat(),
                 "data": data.get("data", []),
                 "summary": data.get("summary", {})
             }
         return {"error": "Unsupported data type"}
 
+# Factories are stateless, so every service instance shares one of each
+_STUDENT_DTO_FACTORY = StudentDTOFactory()
+_FACULTY_DTO_FACTORY = FacultyDTOFactory()
+_ADMIN_DTO_FACTORY = AdminDTOFactory()
+
 # ==================== FACTORY METHOD (ROLE UI FACTORY) ====================
 
 class RoleUIFactory(ABC):
+    def __init__(self):
+        # A role's UI never changes, so it is built once and encoded once per provider option set
+        self._ui = self._build_ui()
+        self._ui_json: Dict[int, bytes] = {}
+
     @abstractmethod
-    def create_ui(self) -> Dict[str, Any]:
+    def _build_ui(self) -> Dict[str, Any]:
         pass
 
-class StudentUIFactory(RoleUIFactory):
     def create_ui(self) -> Dict[str, Any]:
+        return self._ui
+
+    def create_ui_json(self, provider: OrJSONProvider) -> bytes:
+        option = provider.options()
+        encoded = self._ui_json.get(option)
+        if encoded is None:
+            encoded = self._ui_json[option] = provider.dumps_bytes(self._ui)
+        return encoded
+
+class StudentUIFactory(RoleUIFactory):
+    def _build_ui(self) -> Dict[str, Any]:
         return {
             "role": "student",
             "menus": ["Dashboard", "Courses", "Enrollments"],
@@ -161,7 +355,7 @@ class StudentUIFactory(RoleUIFactory):
         }
 
 class FacultyUIFactory(RoleUIFactory):
-    def create_ui(self) -> Dict[str, Any]:
+    def _build_ui(self) -> Dict[str, Any]:
         return {
             "role": "faculty",
             "menus": ["My Courses", "Rosters", "Grades"],
@@ -170,7 +364,7 @@ class FacultyUIFactory(RoleUIFactory):
         }
 
 class AdminUIFactory(RoleUIFactory):
-    def create_ui(self) -> Dict[str, Any]:
+    def _build_ui(self) -> Dict[str, Any]:
         return {
             "role": "administrator",
             "menus": ["Courses", "Reports", "System Config"],
@@ -178,6 +372,10 @@ class AdminUIFactory(RoleUIFactory):
             "routes": {"courses": "/courses", "create_course": "/course", "report": "/reports/enrollment", "config": "/config"}
         }
 
+_STUDENT_UI_FACTORY = StudentUIFactory()
+_FACULTY_UI_FACTORY = FacultyUIFactory()
+_ADMIN_UI_FACTORY = AdminUIFactory()
+
 # ==================== DESIGN PATTERN 3: STRATEGY PATTERN ====================
 
 class ValidationStrategy(ABC):
@@ -237,40 +435,68 @@ class ValidationContext:
     def add_strategy(self, strategy: ValidationStrategy):
         self.strategies.append(strategy)
     
-    def validate_all(self, student_id: str, course_id: str, context: Dict[str, Any]) -> List[Dict[str, Any]]:
-        results = []
+    def iter_validate(self, student_id: str, course_id: str, context: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
         for strategy in self.strategies:
             result = strategy.validate(student_id, course_id, context)
-            results.append(result)
+            yield result
             if not result["valid"]:
-                break  # Stop on first validation failure
-        return results
+                return  # Stop on first validation failure
+
+    def validate_all(self, student_id: str, course_id: str, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return list(self.iter_validate(student_id, course_id, context))
+
+# Strategies are stateless, so enrollment shares prebuilt validators instead of building them per request
+_PREREQ_STRATEGY = PrerequisiteValidationStrategy()
+_CAPACITY_STRATEGY = CapacityValidationStrategy()
+_SCHEDULE_STRATEGY = ScheduleConflictValidationStrategy()
+
+_ENROLLMENT_VALIDATOR = ValidationContext()
+_ENROLLMENT_VALIDATOR.add_strategy(_PREREQ_STRATEGY)
+_ENROLLMENT_VALIDATOR.add_strategy(_CAPACITY_STRATEGY)
+_ENROLLMENT_VALIDATOR.add_strategy(_SCHEDULE_STRATEGY)
+
+# Used for courses without prerequisites, where the prerequisite check doesn't apply
+_NO_PREREQ_ENROLLMENT_VALIDATOR = ValidationContext()
+_NO_PREREQ_ENROLLMENT_VALIDATOR.add_strategy(_CAPACITY_STRATEGY)
+_NO_PREREQ_ENROLLMENT_VALIDATOR.add_strategy(_SCHEDULE_STRATEGY)
 
 # ==================== STRATEGY PATTERN FOR GRADES ====================
 
+_LETTER_GRADES = frozenset({"A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D", "F"})
+_PASS_FAIL_GRADES = frozenset({"P", "F"})
+
 class GradeProcessingStrategy(ABC):
+    SCHEME: str = ""
+    VALID: FrozenSet[str] = frozenset()
+
+    def validate_only(self, grades_data: List[Dict[str, Any]]) -> bool:
+        valid = self.VALID
+        return next((g for g in grades_data if g.get("grade") not in valid), None) is None
+
     @abstractmethod
     def process(self, grades_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         pass
 
 class LetterGradeStrategy(GradeProcessingStrategy):
-    VALID = {"A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D", "F"}
+    SCHEME = "letter"
+    VALID = _LETTER_GRADES
 
     def process(self, grades_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         invalid = [g for g in grades_data if g.get("grade") not in self.VALID]
         return {
-            "scheme": "letter",
+            "scheme": self.SCHEME,
             "valid": len(invalid) == 0,
             "invalid_entries": invalid
         }
 
 class PassFailGradeStrategy(GradeProcessingStrategy):
-    VALID = {"P", "F"}
+    SCHEME = "pass_fail"
+    VALID = _PASS_FAIL_GRADES
 
     def process(self, grades_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         invalid = [g for g in grades_data if g.get("grade") not in self.VALID]
         return {
-            "scheme": "pass_fail",
+            "scheme": self.SCHEME,
             "valid": len(invalid) == 0,
             "invalid_entries": invalid
         }
@@ -280,18 +506,60 @@ class GradeProcessor:
         self.strategy = strategy
     
     def process(self, grades_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # Common case is an all-valid submission: stop at the first bad entry and
+        # only build the full invalid list when there is one
+        if self.strategy.validate_only(grades_data):
+            return {"scheme": self.strategy.SCHEME, "valid": True, "invalid_entries": []}
         return self.strategy.process(grades_data)
 
+# ==================== REQUEST PAYLOAD SCHEMAS ====================
+
+# Reported by a payload validator when the body itself is not a JSON object
+PAYLOAD_BODY = "<body>"
+
+def compile_payload_schema(fields: Dict[str, Any]) -> Callable[[Any], Optional[str]]:
+    """Build a payload validator once; it returns the first field with a missing or mistyped value, or None
+
+    A field is declared by its type, or as ``[{...}]`` for a list whose items are objects with that schema.
+    A body that is not a JSON object at all is reported as PAYLOAD_BODY rather than as one of its fields.
+    """
+    checks: List[Tuple[str, Callable[[Any], bool]]] = []
+    for name, spec in fields.items():
+        if isinstance(spec, list):
+            item_invalid = compile_payload_schema(spec[0])
+            checks.append((name, lambda value, item_invalid=item_invalid: isinstance(value, list)
+                           and all(item_invalid(item) is None for item in value)))
+        else:
+            checks.append((name, lambda value, expected_type=spec: isinstance(value, expected_type)))
+
+    def first_invalid_field(data: Any) -> Optional[str]:
+        if not isinstance(data, dict):
+            return PAYLOAD_BODY
+        for name, is_valid in checks:
+            if not is_valid(data.get(name)):
+                return name
+        return None
+
+    return first_invalid_field
+
+_ENROLLMENT_PAYLOAD = compile_payload_schema({"student_id": str, "course_id": str})
+_COURSE_PAYLOAD = compile_payload_schema({"course_id": str, "name": str, "instructor": str})
+_GRADES_PAYLOAD = compile_payload_schema({"course_id": str, "grades": [{"student_id": str, "grade": str}]})
+
 # ==================== ADMIN NOTIFICATION FACTORY ====================
 
 class NotificationFactory(ABC):
+    __slots__ = ()
+
     @abstractmethod
-    def create(self, notification_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    def create(self, notification_type: str, data: Dict[str, Any], timestamp: Optional[str] = None) -> Dict[str, Any]:
         pass
 
 class AdminNotificationFactory(NotificationFactory):
-    def create(self, notification_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        base: Dict[str, Any] = {"type": notification_type, "timestamp": datetime.now().isoformat()}
+    __slots__ = ()
+
+    def create(self, notification_type: str, data: Dict[str, Any], timestamp: Optional[str] = None) -> Dict[str, Any]:
+        base: Dict[str, Any] = {"type": notification_type, "timestamp": timestamp or datetime.now().isoformat()}
         if notification_type == "system_config_updated":
             base["message"] = data.get("message", "System configuration updated")
             base["recipients"] = ["students", "faculty", "administrators"]
@@ -302,57 +570,218 @@ class AdminNotificationFactory(NotificationFactory):
             base["message"] = data.get("message", "Notification")
         return base
 
+_ADMIN_NOTIFICATION_FACTORY = AdminNotificationFactory()
+
 # ==================== NOTIFICATION SERVICE ====================
 
 class NotificationService:
+    # One stdout listener shared by every instance so handlers only enqueue log records
+    _log_listener: Optional[logging.handlers.QueueListener] = None
+    _log_lock = threading.Lock()
+
     def __init__(self):
         self.event_bus = EventBus()
+        self.logger = self._get_logger()
         self._setup_event_subscriptions()
 
+    @classmethod
+    def _get_logger(cls) -> logging.Logger:
+        logger = logging.getLogger("nexus.notifications")
+        with cls._log_lock:
+            if cls._log_listener is None:
+                log_queue: queue.SimpleQueue = queue.SimpleQueue()
+                stream_handler = logging.StreamHandler(sys.stdout)
+                stream_handler.setFormatter(logging.Formatter("%(message)s"))
+                cls._log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+                cls._log_listener.start()
+                logger.addHandler(logging.handlers.QueueHandler(log_queue))
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+        return logger
+
     def _setup_event_subscriptions(self):
         # Observer pattern: Subscribe to various events
-        self.event_bus.subscribe("student_enrolled", self._handle_enrollment_notification)
-        self.event_bus.subscribe("student_dropped", self._handle_drop_notification)
-        self.event_bus.subscribe("grade_submitted", self._handle_grade_notification)
-        self.event_bus.subscribe("course_created", self._handle_course_created_notification)
-        self.event_bus.subscribe("system_config_updated", self._handle_system_config_notification)
+        self.event_bus.subscribe(EventType.STUDENT_ENROLLED, self._handle_enrollment_notification)
+        self.event_bus.subscribe(EventType.STUDENT_DROPPED, self._handle_drop_notification)
+        self.event_bus.subscribe(EventType.GRADE_SUBMITTED, self._handle_grade_notification)
+        self.event_bus.subscribe(EventType.COURSE_CREATED, self._handle_course_created_notification)
+        self.event_bus.subscribe(EventType.SYSTEM_CONFIG_UPDATED, self._handle_system_config_notification)
 
     def _handle_enrollment_notification(self, event: Event):
         data = event.data
-        print(f"NOTIFICATION: Student {data['student_id']} enrolled in {data['course_id']}")
-        print(f"   → Notifying advisor: {data.get('advisor_email', 'advisor@university.edu')}")
-        print(f"   → Updating billing system for course fees")
+        self.logger.info(f"NOTIFICATION: Student {data['student_id']} enrolled in {data['course_id']}")
+        self.logger.info(f"   → Notifying advisor: {data.get('advisor_email', 'advisor@university.edu')}")
+        self.logger.info(f"   → Updating billing system for course fees")
 
     def _handle_drop_notification(self, event: Event):
         data = event.data
-        print(f"NOTIFICATION: Student {data['student_id']} dropped {data['course_id']}")
-        print(f"   → Notifying waitlisted students")
+        self.logger.info(f"NOTIFICATION: Student {data['student_id']} dropped {data['course_id']}")
+        self.logger.info(f"   → Notifying waitlisted students")
 
     def _handle_grade_notification(self, event: Event):
         data = event.data
-        print(f"NOTIFICATION: Grade {data['grade']} submitted for student {data['student_id']} in {data['course_id']}")
-        print(f"   → Emailing student {data['student_id']}")
-        print(f"   → Informing department administrator")
+        self.logger.info(f"NOTIFICATION: Grade {data['grade']} submitted for student {data['student_id']} in {data['course_id']}")
+        self.logger.info(f"   → Emailing student {data['student_id']}")
+        self.logger.info(f"   → Informing department administrator")
 
     def _handle_course_created_notification(self, event: Event):
         data = event.data
-        print(f"NOTIFICATION: New course {data['course_id']} created by admin")
+        self.logger.info(f"NOTIFICATION: New course {data['course_id']} created by admin")
 
     def _handle_system_config_notification(self, event: Event):
         data = event.data
         msg = data.get("message", "Configuration changed")
-        print(f"SYSTEM CONFIG UPDATE: {msg}")
-        print("   → Notifying all stakeholders: students, faculty, administrators")
+        self.logger.info(f"SYSTEM CONFIG UPDATE: {msg}")
+        self.logger.info("   → Notifying all stakeholders: students, faculty, administrators")
+
+# ==================== ENROLLMENT WRITE BATCHING ====================
+class EnrollmentBatcher:
+    """Applies enroll/drop mutations on a single writer thread, in batches.
+
+    Request threads submit an operation and block on its Future. The writer drains
+    whatever is pending (up to MAX_BATCH) with no timer, so an idle system adds no
+    latency and a burst is coalesced into one batch whose events are published with a
+    single publish_many. Operations append their events to the list they are given.
+    """
+    MAX_BATCH = 64
+
+    def __init__(self, event_bus: EventBus):
+        self._event_bus = event_bus
+        # Many producers, one consumer: deque append/popleft are atomic, the Event only wakes the writer
+        self._pending: Deque[Tuple[Callable[[List[Event]], Any], Future]] = collections.deque()
+        self._work_ready = threading.Event()
+        # stop() enqueues this marker last; the lock keeps submit() from enqueueing anything behind it
+        self._stop_marker: Tuple[Callable[[List[Event]], Any], Future] = (lambda events: None, Future())
+        self._submit_lock = threading.Lock()
+        self._stopped = False
+        self._writer = threading.Thread(target=self._run, daemon=True, name="enrollment-writer")
+        self._writer.start()
+
+    def submit(self, operation: Callable[[List[Event]], Any]) -> Any:
+        future: Future = Future()
+        with self._submit_lock:
+            if self._stopped:
+                raise RuntimeError("EnrollmentBatcher is stopped")
+            self._pending.append((operation, future))
+        self._work_ready.set()
+        return future.result()
+
+    def stop(self):
+        """Apply everything submitted so far, then end the writer thread"""
+        with self._submit_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._pending.append(self._stop_marker)
+        self._work_ready.set()
+        self._writer.join(timeout=5)
+
+    def _run(self):
+        pending = self._pending
+        stop_marker = self._stop_marker
+        while True:
+            self._work_ready.wait()
+            self._work_ready.clear()
+            while pending:
+                events: List[Event] = []
+                applied = []
+                stopping = False
+                for _ in range(min(len(pending), self.MAX_BATCH)):
+                    item = pending.popleft()
+                    if item is stop_marker:
+                        stopping = True
+                        break
+                    operation, future = item
+                    try:
+                        applied.append((future, operation(events)))
+                    except Exception as e:
+                        future.set_exception(e)
+                # Publish before answering, so observers see a write no later than they did unbatched
+                if events:
+                    self._event_bus.publish_many(events)
+                for future, result in applied:
+                    future.set_result(result)
+                if stopping:
+                    return
+
+# ==================== SERVICE HOSTING ====================
+
+class VersionedBodyCache:
+    """A serialized response body tagged with the data version and encoder options it was built with.
+
+    Writers call bump() after changing the data (writes must already be serialized, e.g. by a
+    single writer thread or a lock). A reader takes get(); if it returns no body it builds one
+    and hands it to store() with the version get() returned. A body that raced a write keeps
+    the older tag and is rebuilt next time, and store() never replaces a body from a newer version.
+    Changing the provider's sort_keys/compact switches likewise forces a rebuild.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._cached: Optional[Tuple[int, int, bytes]] = None
+        self._lock = threading.Lock()
+
+    def bump(self):
+        self.version += 1
+
+    def get(self, option: int) -> Tuple[int, Optional[bytes]]:
+        version = self.version
+        cached = self._cached
+        if cached is not None and cached[0] == version and cached[1] == option:
+            return version, cached[2]
+        return version, None
+
+    def store(self, version: int, option: int, body: bytes):
+        with self._lock:
+            cached = self._cached
+            if cached is None or cached[0] < version or (cached[0] == version and cached[1] != option):
+                self._cached = (version, option, body)
+
+class WaitressService:
+    """Base for the HTTP services: a Flask app with the orjson provider, served by waitress.
+
+    run() blocks serving requests and is meant for a dedicated thread; stop() may be called
+    from any other thread. This is the one place that relies on waitress internals: the
+    server's trigger (wakes its asyncore loop), its task_dispatcher (the worker threads)
+    and wasyncore.close_all over the socket map handed to create_server.
+    """
+    SERVICE_NAME = "Service"
+
+    def __init__(self, port: int):
+        self.app = Flask(__name__)
+        self.json_provider = OrJSONProvider(self.app)
+        self.app.json = self.json_provider
+        self.port = port
+        self.ready = threading.Event()  # Set by run() once the port is bound
+        self._server: Any = None  # waitress server, created by run()
+        self._socket_map: Dict[int, Any] = {}  # waitress socket map, so stop() can close open connections
+
+    def run(self):
+        print(f"{self.SERVICE_NAME} running on port {self.port}")
+        # create_server binds the socket immediately, so the service is reachable once ready is set
+        self._server = create_server(self.app, map=self._socket_map, host="127.0.0.1", port=self.port, threads=WSGI_THREADS)
+        self.ready.set()
+        self._server.run()
+
+    def stop(self):
+        if self._server is not None:
+            # Close the listener and any keep-alive connections on the server's own loop thread,
+            # which empties its socket map so run() returns and the port is released
+            self._server.trigger.pull_trigger(lambda: close_all(self._socket_map))
+            self._server.task_dispatcher.shutdown()
 
 # ==================== STUDENT SERVICE ====================
 
-class StudentService:
+class StudentService(WaitressService):
+    SERVICE_NAME = "Student Service"
+
     def __init__(self, port=5001):
-        self.app = Flask(__name__)
-        self.port = port
-        self.dto_factory = StudentDTOFactory()
-        self.ui_factory = StudentUIFactory()
+        super().__init__(port)
+        self.dto_factory = _STUDENT_DTO_FACTORY
+        self.ui_factory = _STUDENT_UI_FACTORY
         self.event_bus = EventBus()
+        # Single writer for courses/student_data; /enroll and /drop go through it
+        self.enrollment_batcher = EnrollmentBatcher(self.event_bus)
 
         # Mock data
         self.courses = {
@@ -369,124 +798,151 @@ class StudentService:
             }
         }
 
+        # Serialized /courses body; the enrollment writer bumps it after changing seat counts
+        self._courses_body = VersionedBodyCache()
+
         self._setup_routes()
     
     def _setup_routes(self):
         @self.app.route('/ui', methods=['GET'])
         def get_ui():
-            return jsonify(self.ui_factory.create_ui())
+            return Response(self.ui_factory.create_ui_json(self.json_provider), mimetype='application/json')
 
         @self.app.route('/courses', methods=['GET'])
         def get_courses():
             """Get all available courses (Factory Method Pattern)"""
-            courses_list = list(self.courses.values())
-            response = self.dto_factory.create_response_dto(courses_list)
-            return jsonify(response)
+            option = self.json_provider.options()
+            version, body = self._courses_body.get(option)
+            if body is None:
+                courses_list = list(self.courses.values())
+                body = self.json_provider.dumps_bytes(self.dto_factory.create_response_dto(courses_list))
+                self._courses_body.store(version, option, body)
+            return Response(body, mimetype='application/json')
         
         @self.app.route('/enroll', methods=['POST'])
         def enroll_student():
             """Enroll student in course (Strategy Pattern + Observer Pattern)"""
             data = request.get_json(silent=True) or {}
-            student_id = data.get('student_id')
-            course_id = data.get('course_id')
-            if not isinstance(student_id, str) or not isinstance(course_id, str):
-                return jsonify({"error": "Invalid payload"}), 400
-            
-            course = self.courses.get(course_id)
-            if not course:
-                return jsonify({"error": "Course not found"}), 404
-            
-            # Strategy Pattern: Validate enrollment
-            validator = ValidationContext()
-            # Add prerequisite strategy only if applicable to the course
-            if course.prerequisites:
-                validator.add_strategy(PrerequisiteValidationStrategy())
-            validator.add_strategy(CapacityValidationStrategy())
-            validator.add_strategy(ScheduleConflictValidationStrategy())
-            
-            context = {
-                "course": course,
-                "student_completed_courses": self.student_data.get(student_id, {}).get("completed_courses", []),
-                "student_current_courses": self.student_data.get(student_id, {}).get("current_courses", [])
-            }
-            
-            validation_results = validator.validate_all(student_id, course_id, context)
-            
-            # Check if all validations passed
-            if not all(result["valid"] for result in validation_results):
-                failed_validation = next(result for result in validation_results if not result["valid"])
-                return jsonify({
-                    "success": False, 
-                    "message": failed_validation["message"],
-                    "validation_results": validation_results
-                }), 400
-            
-            # Enroll student
-            course.enrolled += 1
-            if student_id not in self.student_data:
-                self.student_data[student_id] = {"completed_courses": [], "current_courses": [], "enrollment_history": []}
-            
-            self.student_data[student_id]["current_courses"].append(course_id)
-            self.student_data[student_id]["enrollment_history"].append({
-                "course_id": course_id,
-                "action": "enrolled",
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # Observer Pattern: Publish enrollment event
-            event = Event("student_enrolled", {
-                "student_id": student_id,
-                "course_id": course_id,
-                "advisor_email": f"advisor_{student_id}@university.edu"
-            })
-            self.event_bus.publish(event)
-            
-            return jsonify({
-                "success": True,
-                "message": f"Successfully enrolled in {course.name}",
-                "validation_results": validation_results
-            })
+            if _ENROLLMENT_PAYLOAD(data) is not None:
+                return json_response({"error": "Invalid payload"}), 400
+            student_id: str = data['student_id']
+            course_id: str = data['course_id']
+            # Taken here: flask.g is not available on the writer thread
+            timestamp = request_now_iso()
+            body, status = self.enrollment_batcher.submit(
+                lambda events: self._apply_enrollment(student_id, course_id, timestamp, events))
+            return json_response(body), status
         
         @self.app.route('/drop', methods=['POST'])
         def drop_course():
             """Drop a course (Observer Pattern)"""
             data = request.get_json(silent=True) or {}
-            student_id = data.get('student_id')
-            course_id = data.get('course_id')
-            if not isinstance(student_id, str) or not isinstance(course_id, str):
-                return jsonify({"error": "Invalid payload"}), 400
-            
-            course = self.courses.get(course_id)
-            if not course:
-                return jsonify({"error": "Course not found"}), 404
+            if _ENROLLMENT_PAYLOAD(data) is not None:
+                return json_response({"error": "Invalid payload"}), 400
+            student_id: str = data['student_id']
+            course_id: str = data['course_id']
+            body, status = self.enrollment_batcher.submit(
+                lambda events: self._apply_drop(student_id, course_id, events))
+            return json_response(body), status
+
+    def _apply_enrollment(self, student_id: str, course_id: str, timestamp: str,
+                          events: List[Event]) -> Tuple[Dict[str, Any], int]:
+        """Validate and apply one enrollment; runs on the enrollment writer thread"""
+        course = self.courses.get(course_id)
+        if not course:
+            return {"error": "Course not found"}, 404
+        
+        # Strategy Pattern: Validate enrollment (prerequisite strategy only if applicable to the course)
+        validator = _ENROLLMENT_VALIDATOR if course.prerequisites else _NO_PREREQ_ENROLLMENT_VALIDATOR
+        
+        student = self.student_data.get(student_id, {})
+        context = {
+            "course": course,
+            "student_completed_courses": student.get("completed_courses", []),
+            "student_current_courses": student.get("current_courses", [])
+        }
+        
+        validation_results = []
+        failed_validation = None
+        for result in validator.iter_validate(student_id, course_id, context):
+            validation_results.append(result)
+            if not result["valid"]:
+                failed_validation = result
+        
+        # Validation stops at the first failure, so at most the last result is invalid
+        if failed_validation is not None:
+            return {
+                "success": False, 
+                "message": failed_validation["message"],
+                "validation_results": validation_results
+            }, 400
+        
+        # Enroll student
+        course.enroll()
+        self._courses_body.bump()
+        if student_id not in self.student_data:
+            self.student_data[student_id] = {"completed_courses": [], "current_courses": [], "enrollment_history": []}
+        
+        self.student_data[student_id]["current_courses"].append(course_id)
+        self.student_data[student_id]["enrollment_history"].append({
+            "course_id": course_id,
+            "action": "enrolled",
+            "timestamp": timestamp
+        })
+        
+        # Observer Pattern: enrollment event, published with the rest of the batch
+        events.append(Event(EventType.STUDENT_ENROLLED, {
+            "student_id": student_id,
+            "course_id": course_id,
+            "advisor_email": f"advisor_{student_id}@university.edu"
+        }))
+        
+        return {
+            "success": True,
+            "message": f"Successfully enrolled in {course.name}",
+            "validation_results": validation_results
+        }, 200
+
+    def _apply_drop(self, student_id: str, course_id: str,
+                    events: List[Event]) -> Tuple[Dict[str, Any], int]:
+        """Apply one drop; runs on the enrollment writer thread"""
+        course = self.courses.get(course_id)
+        if not course:
+            return {"error": "Course not found"}, 404
+        
+        if student_id in self.student_data and course_id in self.student_data[student_id]["current_courses"]:
+            course.unenroll()
+            self._courses_body.bump()
+            self.student_data[student_id]["current_courses"].remove(course_id)
             
-            if student_id in self.student_data and course_id in self.student_data[student_id]["current_courses"]:
-                course.enrolled -= 1
-                self.student_data[student_id]["current_courses"].remove(course_id)
-                
-                # Observer Pattern: Publish drop event
-                event = Event("student_dropped", {
-                    "student_id": student_id,
-                    "course_id": course_id
-                })
-                self.event_bus.publish(event)
-                
-                return jsonify({"success": True, "message": f"Successfully dropped {course.name}"})
+            # Observer Pattern: drop event, published with the rest of the batch
+            events.append(Event(EventType.STUDENT_DROPPED, {
+                "student_id": student_id,
+                "course_id": course_id
+            }))
             
-            return jsonify({"error": "Student not enrolled in this course"}), 400
-    
-    def run(self):
-        print(f"Student Service running on port {self.port}")
-        self.app.run(port=self.port, debug=False, use_reloader=False)
+            return {"success": True, "message": f"Successfully dropped {course.name}"}, 200
+        
+        return {"error": "Student not enrolled in this course"}, 400
+
+    def stop(self):
+        super().stop()
+        self.enrollment_batcher.stop()
 
 # ==================== FACULTY SERVICE ====================
 
-class FacultyService:
+class FacultyService(WaitressService):
+    SERVICE_NAME = "Faculty Service"
+
+    # Upper bound on how long a /roster/<course_id>/wait request may hold a server thread
+    MAX_ROSTER_WAIT = 10.0
+    # Waiters allowed at once; kept well below WSGI_THREADS so waiting never starves /roster or /submit_grades
+    MAX_ROSTER_WAITERS = WSGI_THREADS // 4
+
     def __init__(self, port=5002):
-        self.app = Flask(__name__)
-        self.port = port
-        self.dto_factory = FacultyDTOFactory()
-        self.ui_factory = FacultyUIFactory()
+        super().__init__(port)
+        self.dto_factory = _FACULTY_DTO_FACTORY
+        self.ui_factory = _FACULTY_UI_FACTORY
         self.event_bus = EventBus()
 
         # Mock data
@@ -495,49 +951,89 @@ class FacultyService:
             "CS201": Course("CS201", "Data Structures", "Dr. Johnson", 25, 20)
         }
 
-        self.rosters = {
-            "CS101": ["STU001", "STU002", "STU003"],
-            "CS201": ["STU001", "STU004", "STU005"]
+        # course_id -> insertion-ordered set of student ids (dict keys) for O(1) membership and removal
+        self.rosters: Dict[str, Dict[str, None]] = {
+            "CS101": dict.fromkeys(["STU001", "STU002", "STU003"]),
+            "CS201": dict.fromkeys(["STU001", "STU004", "STU005"])
         }
+        # Guards roster mutation and wakes /roster/<course_id>/wait requests on every change
+        self._roster_changed = threading.Condition()
+        self._roster_waiters = threading.BoundedSemaphore(self.MAX_ROSTER_WAITERS)
 
         self.grades = {}
 
         # Subscribe to enrollment/drop events to keep rosters updated (Observer)
-        self.event_bus.subscribe("student_enrolled", self._on_student_enrolled)
-        self.event_bus.subscribe("student_dropped", self._on_student_dropped)
+        self.event_bus.subscribe(EventType.STUDENT_ENROLLED, self._on_student_enrolled)
+        self.event_bus.subscribe(EventType.STUDENT_DROPPED, self._on_student_dropped)
 
         self._setup_routes()
     
     def _setup_routes(self):
         @self.app.route('/ui', methods=['GET'])
         def get_ui():
-            return jsonify(self.ui_factory.create_ui())
+            return Response(self.ui_factory.create_ui_json(self.json_provider), mimetype='application/json')
 
         @self.app.route('/roster/<course_id>', methods=['GET'])
         def get_roster(course_id):
             """Get class roster (Factory Method Pattern)"""
             if course_id not in self.rosters:
-                return jsonify({"error": "Course not found"}), 404
+                return json_response({"error": "Course not found"}), 404
             
+            with self._roster_changed:
+                student_ids = list(self.rosters[course_id])
             roster_data = {
                 "course_id": course_id,
-                "students": [{"student_id": sid, "name": f"Student {sid}"} for sid in self.rosters[course_id]]
+                "students": [{"student_id": sid, "name": f"Student {sid}"} for sid in student_ids]
             }
             
             response = self.dto_factory.create_response_dto(roster_data)
-            return jsonify(response)
+            return json_response(response)
+
+        @self.app.route('/roster/<course_id>/wait', methods=['GET'])
+        def wait_for_roster(course_id):
+            """Block until a student has been added to / removed from a roster (Observer Pattern)"""
+            student_id = request.args.get('student')
+            state = request.args.get('state', 'added')
+            try:
+                timeout = float(request.args.get('timeout', 2.0))
+            except ValueError:
+                timeout = math.nan  # Unparseable: rejected below like any other non-finite value
+            if not student_id or state not in ("added", "removed"):
+                return json_response({"error": "Invalid query: student and state (added|removed) required"}), 400
+            if not math.isfinite(timeout) or timeout < 0:
+                return json_response({"error": "Invalid query: timeout must be a finite, non-negative number"}), 400
+            if course_id not in self.rosters:
+                return json_response({"error": "Course not found"}), 404
+            
+            if not self._roster_waiters.acquire(blocking=False):
+                return json_response({"error": "Too many roster waiters, retry later"}), 503
+            try:
+                roster = self.rosters[course_id]
+                expect_present = state == "added"
+                with self._roster_changed:
+                    reached = self._roster_changed.wait_for(
+                        lambda: (student_id in roster) == expect_present,
+                        timeout=min(timeout, self.MAX_ROSTER_WAIT)
+                    )
+            finally:
+                self._roster_waiters.release()
+            
+            result = {"course_id": course_id, "student_id": student_id, "state": state}
+            if not reached:
+                return json_response({**result, "error": "Timed out waiting for roster change"}), 408
+            return json_response(result)
         
         @self.app.route('/submit_grades', methods=['POST'])
         def submit_grades():
             """Submit grades for a course (Observer Pattern)"""
             data = request.get_json(silent=True) or {}
-            course_id = data.get('course_id')
-            grades_data = data.get('grades')  # List of {student_id, grade}
+            if _GRADES_PAYLOAD(data) is not None:
+                return json_response({"error": "Invalid grades payload"}), 400
+            course_id: str = data['course_id']
+            grades_data: List[Dict[str, str]] = data['grades']  # List of {student_id, grade}
             
             if course_id not in self.courses:
-                return jsonify({"error": "Course not found"}), 404
-            if not isinstance(grades_data, list):
-                return jsonify({"error": "Invalid grades payload"}), 400
+                return json_response({"error": "Course not found"}), 404
 
             # Strategy Pattern: grade processing (letter vs pass/fail)
             strategy: GradeProcessingStrategy = LetterGradeStrategy()
@@ -546,26 +1042,28 @@ class FacultyService:
             processor = GradeProcessor(strategy)
             processed = processor.process(grades_data)
             if not processed["valid"]:
-                return jsonify({"success": False, "error": "Invalid grade entries", "details": processed}), 400
+                return json_response({"success": False, "error": "Invalid grade entries", "details": processed}), 400
             
             # Store grades
             if course_id not in self.grades:
                 self.grades[course_id] = {}
             
+            course_grades = self.grades[course_id]
             for grade_entry in grades_data:
-                student_id = grade_entry['student_id']
-                grade = grade_entry['grade']
-                self.grades[course_id][student_id] = grade
-                
-                # Observer Pattern: Publish grade submission event
-                event = Event("grade_submitted", {
-                    "student_id": student_id,
+                course_grades[grade_entry['student_id']] = grade_entry['grade']
+            
+            # Observer Pattern: Publish all grade submission events in one batch
+            events = [
+                Event(EventType.GRADE_SUBMITTED, {
+                    "student_id": grade_entry['student_id'],
                     "course_id": course_id,
-                    "grade": grade
+                    "grade": grade_entry['grade']
                 })
-                self.event_bus.publish(event)
+                for grade_entry in grades_data
+            ]
+            self.event_bus.publish_many(events)
             
-            return jsonify({
+            return json_response({
                 "success": True,
                 "message": f"Grades submitted for {len(grades_data)} students in {course_id}",
                 "processing": processed
@@ -581,7 +1079,7 @@ class FacultyService:
             for course in faculty_courses:
                 response_courses.append(self.dto_factory.create_response_dto(course))
             
-            return jsonify({"courses": response_courses})
+            return json_response({"courses": response_courses})
 
     # Observer callbacks within FacultyService
     def _on_student_enrolled(self, event: Event):
@@ -590,9 +1088,13 @@ class FacultyService:
         sid = data.get("student_id")
         if not isinstance(cid, str) or not isinstance(sid, str):
             return
-        if cid in self.rosters and sid not in self.rosters[cid]:
-            self.rosters[cid].append(sid)
-            print(f"FACULTY SERVICE: Added {sid} to roster for {cid}")
+        with self._roster_changed:
+            roster = self.rosters.get(cid)
+            if roster is None or sid in roster:
+                return
+            roster[sid] = None
+            self._roster_changed.notify_all()
+        print(f"FACULTY SERVICE: Added {sid} to roster for {cid}")
 
     def _on_student_dropped(self, event: Event):
         data = event.data
@@ -600,23 +1102,24 @@ class FacultyService:
         sid = data.get("student_id")
         if not isinstance(cid, str) or not isinstance(sid, str):
             return
-        if cid in self.rosters and sid in self.rosters[cid]:
-            self.rosters[cid].remove(sid)
-            print(f"FACULTY SERVICE: Removed {sid} from roster for {cid}")
-    
-    def run(self):
-        print(f"Faculty Service running on port {self.port}")
-        self.app.run(port=self.port, debug=False, use_reloader=False)
+        with self._roster_changed:
+            roster = self.rosters.get(cid)
+            if roster is None or sid not in roster:
+                return
+            del roster[sid]
+            self._roster_changed.notify_all()
+        print(f"FACULTY SERVICE: Removed {sid} from roster for {cid}")
 
 # ==================== ADMINISTRATOR SERVICE ====================
 
-class AdminService:
+class AdminService(WaitressService):
+    SERVICE_NAME = "Admin Service"
+
     def __init__(self, port=5003):
-        self.app = Flask(__name__)
-        self.port = port
-        self.dto_factory = AdminDTOFactory()
-        self.ui_factory = AdminUIFactory()
-        self.notification_factory = AdminNotificationFactory()
+        super().__init__(port)
+        self.dto_factory = _ADMIN_DTO_FACTORY
+        self.ui_factory = _ADMIN_UI_FACTORY
+        self.notification_factory = _ADMIN_NOTIFICATION_FACTORY
         self.event_bus = EventBus()
 
         # Mock data
@@ -626,36 +1129,50 @@ class AdminService:
             "CS301": Course("CS301", "Algorithms", "Dr. Brown", 20, 15)
         }
 
+        # Serialized /courses body; course creation and the enroll/drop observers bump it under _agg_lock
+        self._courses_body = VersionedBodyCache()
+
+        # Running totals for the report summary, kept in step by create_course and the enroll/drop observers
+        self._agg_lock = threading.Lock()
+        self._agg_capacity = sum(course.capacity for course in self.courses.values())
+        self._agg_enrolled = sum(course.enrolled for course in self.courses.values())
+
+        # Subscribe to enrollment/drop events to keep the admin view of courses current (Observer)
+        self.event_bus.subscribe(EventType.STUDENT_ENROLLED, self._on_student_enrolled)
+        self.event_bus.subscribe(EventType.STUDENT_DROPPED, self._on_student_dropped)
+
         self._setup_routes()
     
     def _setup_routes(self):
         @self.app.route('/ui', methods=['GET'])
         def get_ui():
-            return jsonify(self.ui_factory.create_ui())
+            return Response(self.ui_factory.create_ui_json(self.json_provider), mimetype='application/json')
 
         @self.app.route('/courses', methods=['GET'])
         def get_all_courses():
             """Get all courses with admin view (Factory Method Pattern)"""
-            courses_list = list(self.courses.values())
-            admin_courses = [self.dto_factory.create_response_dto(course) for course in courses_list]
-            return jsonify({"courses": admin_courses})
+            option = self.json_provider.options()
+            version, body = self._courses_body.get(option)
+            if body is None:
+                courses_list = list(self.courses.values())
+                admin_courses = [self.dto_factory.create_response_dto(course) for course in courses_list]
+                body = self.json_provider.dumps_bytes({"courses": admin_courses})
+                self._courses_body.store(version, option, body)
+            return Response(body, mimetype='application/json')
         
         @self.app.route('/course', methods=['POST'])
         def create_course():
             """Create a new course (Observer Pattern)"""
             data = request.get_json(silent=True) or {}
-            course_id = data.get('course_id')
-            name = data.get('name')
-            instructor = data.get('instructor')
+            # Validate and narrow types
+            invalid_field = _COURSE_PAYLOAD(data)
+            if invalid_field is not None:
+                return json_response({"error": f"Invalid payload: {invalid_field}"}), 400
+            course_id_str: str = data['course_id']
+            name_str: str = data['name']
+            instructor_str: str = data['instructor']
             capacity = data.get('capacity', 20)
             prerequisites = data.get('prerequisites', [])
-            # Validate and narrow types
-            if not isinstance(course_id, str):
-                return jsonify({"error": "Invalid payload: course_id"}), 400
-            if not isinstance(name, str):
-                return jsonify({"error": "Invalid payload: name"}), 400
-            if not isinstance(instructor, str):
-                return jsonify({"error": "Invalid payload: instructor"}), 400
             if not isinstance(capacity, int):
                 try:
                     capacity = int(capacity)
@@ -665,51 +1182,54 @@ class AdminService:
                 prerequisites = []
             else:
                 prerequisites = [str(p) for p in prerequisites]
-
-            course_id_str: str = course_id
-            name_str: str = name
-            instructor_str: str = instructor
             
             if course_id_str in self.courses:
-                return jsonify({"error": "Course already exists"}), 400
+                return json_response({"error": "Course already exists"}), 400
             
             new_course = Course(course_id_str, name_str, instructor_str, capacity, 0, prerequisites)
-            self.courses[course_id_str] = new_course
+            with self._agg_lock:
+                self.courses[course_id_str] = new_course
+                self._agg_capacity += new_course.capacity
+                self._courses_body.bump()
             
             # Observer Pattern: Publish course creation event
             payload = {
-                "course_id": course_id,
-                "name": name,
-                "instructor": instructor,
-                "notification": self.notification_factory.create("course_created", {"course_id": course_id})
+                "course_id": course_id_str,
+                "name": name_str,
+                "instructor": instructor_str,
+                "notification": self.notification_factory.create("course_created", {"course_id": course_id_str}, request_now_iso())
             }
-            event = Event("course_created", payload)
+            event = Event(EventType.COURSE_CREATED, payload)
             self.event_bus.publish(event)
             
             response = self.dto_factory.create_response_dto(new_course)
-            return jsonify({"success": True, "course": response})
+            return json_response({"success": True, "course": response})
         
         @self.app.route('/reports/enrollment', methods=['GET'])
         def generate_enrollment_report():
             """Generate enrollment report (Factory Method Pattern + Strategy Pattern)"""
             # Strategy Pattern could be used here for different report types
-            total_capacity = sum(course.capacity for course in self.courses.values())
-            total_enrolled = sum(course.enrolled for course in self.courses.values())
-            
-            report_data = {
-                "report_type": "enrollment_summary",
-                "data": [
+            # Totals come from the running aggregates; the lock keeps them consistent with the rows
+            with self._agg_lock:
+                rows = [
                     {
                         "course_id": course.course_id,
                         "name": course.name,
                         "enrolled": course.enrolled,
                         "capacity": course.capacity,
-                        "utilization": round((course.enrolled / course.capacity) * 100, 2)
+                        "utilization": course.utilization
                     }
                     for course in self.courses.values()
-                ],
+                ]
+                total_capacity = self._agg_capacity
+                total_enrolled = self._agg_enrolled
+            
+            report_data = {
+                "report_type": "enrollment_summary",
+                "generated_at": request_now_iso(),
+                "data": rows,
                 "summary": {
-                    "total_courses": len(self.courses),
+                    "total_courses": len(rows),
                     "total_capacity": total_capacity,
                     "total_enrolled": total_enrolled,
                     "overall_utilization": round((total_enrolled / total_capacity) * 100, 2)
@@ -717,22 +1237,47 @@ class AdminService:
             }
             
             response = self.dto_factory.create_response_dto(report_data)
-            return jsonify(response)
+            return json_response(response)
 
         @self.app.route('/config', methods=['POST'])
         def update_system_config():
             """Simulate a system-wide configuration change (Observer Pattern + Factory Method for notifications)."""
             data = request.get_json(silent=True) or {}
+            if not isinstance(data, dict):
+                return json_response({"error": f"Invalid payload: {PAYLOAD_BODY}"}), 400
             message = data.get('message', 'System maintenance scheduled')
-            notification = self.notification_factory.create("system_config_updated", {"message": message})
+            if not isinstance(message, str):
+                return json_response({"error": "Invalid payload: message"}), 400
+            notification = self.notification_factory.create("system_config_updated", {"message": message}, request_now_iso())
             # Publish a system-wide change event
-            event = Event("system_config_updated", {"message": message, "notification": notification})
+            event = Event(EventType.SYSTEM_CONFIG_UPDATED, {"message": message, "notification": notification})
             self.event_bus.publish(event)
-            return jsonify({"success": True, "message": message})
+            return json_response({"success": True, "message": message})
     
-    def run(self):
-        print(f"Admin Service running on port {self.port}")
-        self.app.run(port=self.port, debug=False, use_reloader=False)
+    # Observer callbacks within AdminService
+    def _on_student_enrolled(self, event: Event):
+        cid = event.data.get("course_id")
+        if not isinstance(cid, str):
+            return
+        course = self.courses.get(cid)
+        if course is None:
+            return
+        with self._agg_lock:
+            course.enroll()
+            self._agg_enrolled += 1
+            self._courses_body.bump()
+
+    def _on_student_dropped(self, event: Event):
+        cid = event.data.get("course_id")
+        if not isinstance(cid, str):
+            return
+        course = self.courses.get(cid)
+        if course is None:
+            return
+        with self._agg_lock:
+            course.unenroll()
+            self._agg_enrolled -= 1
+            self._courses_body.bump()
 
 # ==================== MAIN APPLICATION AND DEMO ====================
 
@@ -742,14 +1287,15 @@ def run_service_in_thread(service):
     thread.start()
     return thread
 
-def demo_system():
+def demo_system(*services):
     """Demonstrate the system functionality"""
     print("\n" + "="*60)
     print("NEXUS ENROLL SYSTEM DEMO")
     print("="*60)
     
     # Wait for services to start
-    time.sleep(2)
+    for service in services:
+        service.ready.wait(timeout=10)
     
     base_urls = {
         "student": "http://localhost:5001",
@@ -757,18 +1303,23 @@ def demo_system():
         "admin": "http://localhost:5003"
     }
     
+    # One keep-alive session for the whole demo instead of a new connection per call
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0))
+    
     try:
         # 0. Fetch role-based UIs (Factory Method: UI creation)
         print("\n0. Fetching role-based UIs...")
-        ui_student = requests.get(f"{base_urls['student']}/ui").json()
-        ui_faculty = requests.get(f"{base_urls['faculty']}/ui").json()
-        ui_admin = requests.get(f"{base_urls['admin']}/ui").json()
+        # The three UI fetches are independent, so issue them concurrently
+        ui_urls = [f"{base_urls[role]}/ui" for role in ("student", "faculty", "admin")]
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            ui_student, ui_faculty, ui_admin = executor.map(lambda url: session.get(url).json(), ui_urls)
         print(f"   Student UI menus: {ui_student['menus']}")
         print(f"   Faculty UI menus: {ui_faculty['menus']}")
         print(f"   Admin UI menus: {ui_admin['menus']}")
         # 1. Admin creates a new course
         print("\n1. ADMIN: Creating a new course...")
-        admin_response = requests.post(f"{base_urls['admin']}/course", json={
+        admin_response = session.post(f"{base_urls['admin']}/course", json={
             "course_id": "CS401",
             "name": "Advanced Software Engineering", 
             "instructor": "Dr. Wilson",
@@ -779,12 +1330,12 @@ def demo_system():
         
         # 2. Student views available courses
         print("\n2. STUDENT: Viewing available courses...")
-        courses_response = requests.get(f"{base_urls['student']}/courses")
+        courses_response = session.get(f"{base_urls['student']}/courses")
         print(f"   Found {len(courses_response.json()['courses'])} courses")
         
         # 3. Student attempts enrollment (should succeed for CS201)
         print("\n3. STUDENT: Attempting to enroll in CS201...")
-        enroll_response = requests.post(f"{base_urls['student']}/enroll", json={
+        enroll_response = session.post(f"{base_urls['student']}/enroll", json={
             "student_id": "STU001",
             "course_id": "CS201"
         })
@@ -792,7 +1343,7 @@ def demo_system():
         
         # 4. Student attempts enrollment in advanced course (should fail - missing prerequisites)
         print("\n4. STUDENT: Attempting to enroll in CS401 (should fail)...")
-        enroll_fail_response = requests.post(f"{base_urls['student']}/enroll", json={
+        enroll_fail_response = session.post(f"{base_urls['student']}/enroll", json={
             "student_id": "STU002", 
             "course_id": "CS401"
         })
@@ -800,12 +1351,12 @@ def demo_system():
         
         # 5. Faculty views roster
         print("\n5. FACULTY: Viewing CS101 roster...")
-        roster_response = requests.get(f"{base_urls['faculty']}/roster/CS101")
+        roster_response = session.get(f"{base_urls['faculty']}/roster/CS101")
         print(f"   Response: {roster_response.json()}")
         
         # 6. Faculty submits grades
         print("\n6. FACULTY: Submitting grades...")
-        grades_response = requests.post(f"{base_urls['faculty']}/submit_grades", json={
+        grades_response = session.post(f"{base_urls['faculty']}/submit_grades", json={
             "course_id": "CS101",
             "grades": [
                 {"student_id": "STU001", "grade": "A"},
@@ -816,14 +1367,14 @@ def demo_system():
         
         # 7. Admin generates report
         print("\n7. Generating enrollment report...")
-        report_response = requests.get(f"{base_urls['admin']}/reports/enrollment")
+        report_response = session.get(f"{base_urls['admin']}/reports/enrollment")
         report_data = report_response.json()
         print(f"   Total Courses: {report_data['summary']['total_courses']}")
         print(f"   Overall Utilization: {report_data['summary']['overall_utilization']}%")
         
         # 8. Student drops a course
         print("\n8. STUDENT: Dropping CS201...")
-        drop_response = requests.post(f"{base_urls['student']}/drop", json={
+        drop_response = session.post(f"{base_urls['student']}/drop", json={
             "student_id": "STU001",
             "course_id": "CS201"
         })
@@ -831,7 +1382,7 @@ def demo_system():
         
         # 9. Admin performs a system-wide configuration update
         print("\n9. ADMIN: Updating system configuration...")
-        cfg_response = requests.post(f"{base_urls['admin']}/config", json={
+        cfg_response = session.post(f"{base_urls['admin']}/config", json={
             "message": "System will undergo maintenance at 11 PM"
         })
         print(f"   Response: {cfg_response.json()}")
@@ -877,11 +1428,18 @@ if __name__ == "__main__":
     print("Admin Service: http://localhost:5003")
     
     # Run demo
-    demo_system()
+    demo_system(student_service, faculty_service, admin_service)
     
-    # Keep main thread alive
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\n\nShutting down services...")
\ No newline at end of file
+    # Keep main thread alive until Ctrl+C / SIGTERM. POSIX interrupts a blocking wait to run the signal
+    # handler; Windows only runs it once the wait returns, so there the wait wakes once a second
+    stop_requested = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_requested.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_requested.set())
+    wait_timeout = 1.0 if sys.platform == "win32" else None
+    while not stop_requested.wait(wait_timeout):
+        pass
+    print("\n\nShutting down services...")
+    for service in (student_service, faculty_service, admin_service):
+        service.stop()
+    for thread in (student_thread, faculty_thread, admin_thread):
+        thread.join(timeout=5)
\ No newline at end of file
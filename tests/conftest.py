@@ -0,0 +1,54 @@
+import sys
+import threading
+from importlib import import_module
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def run_service_in_thread(service):
+    t = threading.Thread(target=service.run, daemon=True)
+    t.start()
+    return t
+
+
+@pytest.fixture(scope="session")
+def main_mod():
+    # Import main.py once per session instead of re-executing it for every test
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    return import_module("main")
+
+
+@pytest.fixture(scope="session")
+def services(main_mod):
+    _notif = main_mod.NotificationService()
+    student = main_mod.StudentService(port=5101)
+    faculty = main_mod.FacultyService(port=5102)
+    admin = main_mod.AdminService(port=5103)
+
+    ts = [
+        run_service_in_thread(student),
+        run_service_in_thread(faculty),
+        run_service_in_thread(admin),
+    ]
+
+    for service in (student, faculty, admin):
+        assert service.ready.wait(timeout=10), f"Service on port {service.port} not ready"
+
+    yield {
+        "threads": ts,
+        "base": {
+            "student": "http://localhost:5101",
+            "faculty": "http://localhost:5102",
+            "admin": "http://localhost:5103",
+        },
+    }
+
+    for service in (student, faculty, admin):
+        service.stop()
+    for t in ts:
+        t.join(timeout=5)
@@ -1,83 +1,50 @@
+import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 import requests
-import threading
-import importlib.util
-from pathlib import Path
-
-
-MAIN_PY = Path(__file__).resolve().parents[1] / "main.py"
-
-
-def load_main_module():
-    spec = importlib.util.spec_from_file_location("nexus_main", str(MAIN_PY))
-    assert spec is not None
-    mod = importlib.util.module_from_spec(spec)
-    assert spec.loader is not None
-    spec.loader.exec_module(mod)
-    return mod
-
-
-def run_service_in_thread(service):
-    t = threading.Thread(target=service.run, daemon=True)
-    t.start()
-    return t
-
-
-def wait_for_ready(url: str, timeout: float = 10.0):
-    start = time.time()
-    last_err = None
-    while time.time() - start < timeout:
-        try:
-            r = requests.get(url, timeout=1.5)
-            if r.status_code in (200, 404):
-                return True
-        except Exception as e: 
-            last_err = e
-        time.sleep(0.2)
-    raise AssertionError(f"Service at {url} not ready: {last_err}")
-
-
-def setup_services():
-    mod = load_main_module()
-    _notif = mod.NotificationService()
-    student = mod.StudentService(port=5101)
-    faculty = mod.FacultyService(port=5102)
-    admin = mod.AdminService(port=5103)
-
-    ts = [
-        run_service_in_thread(student),
-        run_service_in_thread(faculty),
-        run_service_in_thread(admin),
-    ]
-
-    wait_for_ready("http://localhost:5101/ui")
-    wait_for_ready("http://localhost:5102/ui")
-    wait_for_ready("http://localhost:5103/ui")
-
-    return {
-        "threads": ts,
-        "base": {
-            "student": "http://localhost:5101",
-            "faculty": "http://localhost:5102",
-            "admin": "http://localhost:5103",
-        },
-    }
+from requests.adapters import HTTPAdapter
+
+
+# Shared keep-alive session so the suite reuses connections instead of reconnecting per request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0))
 
 
-def test_end_to_end_system():
-    ctx = setup_services()
-    base = ctx["base"]
+def admin_cs101_enrollment(base):
+    """(report total_enrolled, report CS101 enrolled, admin /courses CS101 enrolled)"""
+    report = SESSION.get(f"{base['admin']}/reports/enrollment", timeout=5).json()
+    courses = SESSION.get(f"{base['admin']}/courses", timeout=5).json()["courses"]
+    report_row = next(row for row in report["data"] if row["course_id"] == "CS101")
+    course_row = next(row for row in courses if row["course_id"] == "CS101")
+    return report["summary"]["total_enrolled"], report_row["enrolled"], course_row["enrolled"]
+
+
+def wait_for_admin_enrollment(base, expected, timeout=5.0):
+    """Admin counts follow enroll/drop through an asynchronous observer, so poll until they settle"""
+    deadline = time.monotonic() + timeout
+    while True:
+        current = admin_cs101_enrollment(base)
+        if current == expected or time.monotonic() >= deadline:
+            return current
+        time.sleep(0.02)
+
+
+def test_end_to_end_system(main_mod, services):
+    base = services["base"]
 
     # 1) UI endpoints (Factory Method: role UIs)
-    ui_student = requests.get(f"{base['student']}/ui").json()
-    ui_faculty = requests.get(f"{base['faculty']}/ui").json()
-    ui_admin = requests.get(f"{base['admin']}/ui").json()
+    ui_student = SESSION.get(f"{base['student']}/ui").json()
+    ui_faculty = SESSION.get(f"{base['faculty']}/ui").json()
+    ui_admin = SESSION.get(f"{base['admin']}/ui").json()
     assert ui_student.get("role") == "student"
     assert ui_faculty.get("role") == "faculty"
     assert ui_admin.get("role") == "administrator"
 
     # 2) Admin: create a new course
-    resp = requests.post(
+    resp = SESSION.post(
         f"{base['admin']}/course",
         json={
             "course_id": "CS999",
@@ -94,18 +61,22 @@ def test_end_to_end_system():
     assert data.get("course", {}).get("course_id") == "CS999"
 
     # 3) Admin: invalid payload
-    bad = requests.post(
+    bad = SESSION.post(
         f"{base['admin']}/course", json={"course_id": 123, "name": None, "instructor": []}, timeout=5
     )
     assert bad.status_code == 400
+    not_an_object = SESSION.post(f"{base['admin']}/course", json=[1], timeout=5)
+    assert not_an_object.status_code == 400
+    assert not_an_object.json()["error"] == "Invalid payload: <body>"
 
     # 4) Student: list courses
-    courses = requests.get(f"{base['student']}/courses", timeout=5).json()
+    courses = SESSION.get(f"{base['student']}/courses", timeout=5).json()
     assert "courses" in courses and isinstance(courses["courses"], list)
     assert any(c.get("course_id") == "CS101" for c in courses["courses"]) 
 
     # 5) Student: enroll success (Observer + Strategy validations)
-    enroll = requests.post(
+    admin_before = admin_cs101_enrollment(base)
+    enroll = SESSION.post(
         f"{base['student']}/enroll", json={"student_id": "STU004", "course_id": "CS101"}, timeout=5
     )
     assert enroll.status_code == 200, enroll.text
@@ -113,18 +84,22 @@ def test_end_to_end_system():
     assert ej.get("success") is True
 
     # 6) Faculty: roster reflects enrollment via observer
-    for _ in range(20):
-        roster = requests.get(f"{base['faculty']}/roster/CS101", timeout=5)
-        if roster.status_code == 200:
-            students = roster.json().get("students", [])
-            if any(s.get("student_id") == "STU004" for s in students):
-                break
-        time.sleep(0.2)
-    else:
-        raise AssertionError("STU004 not added to CS101 roster via observer")
+    added = SESSION.get(
+        f"{base['faculty']}/roster/CS101/wait",
+        params={"student": "STU004", "state": "added", "timeout": 5},
+        timeout=10,
+    )
+    assert added.status_code == 200, "STU004 not added to CS101 roster via observer"
+    roster = SESSION.get(f"{base['faculty']}/roster/CS101", timeout=5)
+    assert roster.status_code == 200
+    assert any(s.get("student_id") == "STU004" for s in roster.json().get("students", []))
+
+    # Admin: report totals and the CS101 row count the enrollment via observer
+    admin_enrolled = tuple(count + 1 for count in admin_before)
+    assert wait_for_admin_enrollment(base, admin_enrolled) == admin_enrolled
 
     # 7) Student: enroll failure (missing prereqs)
-    fail = requests.post(
+    fail = SESSION.post(
         f"{base['student']}/enroll", json={"student_id": "STU002", "course_id": "CS201"}, timeout=5
     )
     assert fail.status_code == 400
@@ -133,15 +108,22 @@ def test_end_to_end_system():
     assert "Missing prerequisites" in fj.get("message", "")
 
     # 8) Faculty: submit invalid grades
-    invalid_grades = requests.post(
+    invalid_grades = SESSION.post(
         f"{base['faculty']}/submit_grades",
         json={"course_id": "CS101", "grades": [{"student_id": "STU004", "grade": "Z"}]},
         timeout=5,
     )
     assert invalid_grades.status_code == 400
+    for malformed in (
+        [1],
+        {"course_id": "CS101", "grades": [{"grade": "A"}]},
+        {"course_id": "CS101", "grades": ["A"]},
+    ):
+        bad_grades = SESSION.post(f"{base['faculty']}/submit_grades", json=malformed, timeout=5)
+        assert bad_grades.status_code == 400, malformed
 
     # 9) Faculty: submit valid grades
-    valid_grades = requests.post(
+    valid_grades = SESSION.post(
         f"{base['faculty']}/submit_grades",
         json={
             "course_id": "CS101",
@@ -157,19 +139,174 @@ def test_end_to_end_system():
     assert vg.get("success") is True
 
     # 10) Student: drop course and roster reflects removal
-    drop = requests.post(
+    drop = SESSION.post(
         f"{base['student']}/drop", json={"student_id": "STU004", "course_id": "CS101"}, timeout=5
     )
     assert drop.status_code == 200, drop.text
-    for _ in range(20):
-        roster2 = requests.get(f"{base['faculty']}/roster/CS101", timeout=5)
-        students2 = roster2.json().get("students", [])
-        if all(s.get("student_id") != "STU004" for s in students2):
-            break
-        time.sleep(0.2)
-    else:
-        raise AssertionError("STU004 not removed from CS101 roster via observer after drop")
+    removed = SESSION.get(
+        f"{base['faculty']}/roster/CS101/wait",
+        params={"student": "STU004", "state": "removed", "timeout": 5},
+        timeout=10,
+    )
+    assert removed.status_code == 200, "STU004 not removed from CS101 roster via observer after drop"
+    students2 = SESSION.get(f"{base['faculty']}/roster/CS101", timeout=5).json().get("students", [])
+    assert all(s.get("student_id") != "STU004" for s in students2)
+    assert wait_for_admin_enrollment(base, admin_before) == admin_before
+    never = SESSION.get(
+        f"{base['faculty']}/roster/CS101/wait",
+        params={"student": "STU999", "state": "added", "timeout": 0},
+        timeout=5,
+    )
+    assert never.status_code == 408
+    for bad_timeout in ("nan", "inf", "-1", "abc"):
+        bad_wait = SESSION.get(
+            f"{base['faculty']}/roster/CS101/wait",
+            params={"student": "STU999", "state": "added", "timeout": bad_timeout},
+            timeout=5,
+        )
+        assert bad_wait.status_code == 400, bad_timeout
+
+    # Faculty: roster waiters are capped, so waiting can never take every server thread
+    max_waiters = main_mod.FacultyService.MAX_ROSTER_WAITERS
+
+    def wait_for_absent_student(timeout):
+        return SESSION.get(
+            f"{base['faculty']}/roster/CS101/wait",
+            params={"student": "STU999", "state": "added", "timeout": timeout},
+            timeout=10,
+        ).status_code
+
+    with ThreadPoolExecutor(max_workers=max_waiters) as pool:
+        waiters = [pool.submit(wait_for_absent_student, 2) for _ in range(max_waiters)]
+        deadline = time.monotonic() + 1.5
+        overflow = wait_for_absent_student(0)
+        while overflow != 503 and time.monotonic() < deadline:
+            time.sleep(0.02)
+            overflow = wait_for_absent_student(0)
+        assert overflow == 503
+        assert [w.result() for w in waiters] == [408] * max_waiters
 
     # 11) Admin: system config update
-    cfg = requests.post(f"{base['admin']}/config", json={"message": "Testing config"}, timeout=5)
+    cfg = SESSION.post(f"{base['admin']}/config", json={"message": "Testing config"}, timeout=5)
     assert cfg.status_code == 200
+    for bad_body in ([1], {"message": {"nested": "value"}}, {"message": 42}):
+        bad_cfg = SESSION.post(f"{base['admin']}/config", json=bad_body, timeout=5)
+        assert bad_cfg.status_code == 400, bad_body
+
+
+def enroll_concurrently(student, course_id, count):
+    """POST /enroll for `count` distinct students at once; returns the status codes"""
+    start = threading.Barrier(count)
+
+    def enroll(n):
+        start.wait()
+        with student.app.test_client() as client:
+            return client.post("/enroll", json={"student_id": f"LOAD{n:03d}", "course_id": course_id}).status_code
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        return list(pool.map(enroll, range(count)))
+
+
+def slow_enroll_course(main_mod):
+    """A course whose enroll() sleeps between the capacity check and the seat count update"""
+    class SlowEnrollCourse(main_mod.Course):
+        def enroll(self):
+            time.sleep(0.05)
+            super().enroll()
+
+    # A course of its own: the Faculty/Admin observers ignore course ids they do not know
+    return SlowEnrollCourse("LOAD101", "Load Test", "Dr. Load", 30, 25)
+
+
+@pytest.mark.parametrize("batched", [True, False])
+def test_concurrent_enrollments_never_overfill_a_course(main_mod, batched):
+    student = main_mod.StudentService(port=0)
+    course = slow_enroll_course(main_mod)
+    student.courses[course.course_id] = course
+    if not batched:
+        # The unsynchronized path: every request thread applies its own enrollment
+        student.enrollment_batcher.submit = lambda operation: operation([])
+    try:
+        statuses = enroll_concurrently(student, course.course_id, 20)
+    finally:
+        student.stop()
+
+    if batched:
+        assert statuses.count(200) == 5
+        assert statuses.count(400) == 15
+        assert course.enrolled == course.capacity
+    else:
+        # Guards the test itself: without the single writer the widened race window overfills the course
+        assert course.enrolled > course.capacity
+
+
+def test_enrollment_batcher_reports_failures_and_keeps_running(main_mod):
+    batcher = main_mod.EnrollmentBatcher(main_mod.EventBus())
+
+    def failing(events):
+        raise ValueError("boom")
+
+    try:
+        with pytest.raises(ValueError, match="boom"):
+            batcher.submit(failing)
+        assert batcher.submit(lambda events: "still running") == "still running"
+    finally:
+        batcher.stop()
+    with pytest.raises(RuntimeError):
+        batcher.submit(lambda events: None)
+
+
+def test_json_provider_handles_values_beyond_orjson_limits(main_mod):
+    provider = main_mod.OrJSONProvider(main_mod.Flask(__name__))
+    wide = {"id": 123456789012345678901234567890}
+    deep = {"x": 1}
+    for _ in range(300):
+        deep = {"x": deep}
+
+    assert provider.loads(provider.dumps_bytes(wide)) == wide
+    assert provider.loads(provider.dumps_bytes(deep)) == deep
+
+
+def test_event_bus_overflow_drops_oldest_and_warns(main_mod, caplog):
+    # A bus outside the singleton whose consumer is never started, so nothing drains the queue
+    bus = object.__new__(main_mod.EventBus)
+    bus.MAX_PENDING_EVENTS = 3
+    bus._init_state()
+    events = [main_mod.Event(main_mod.EventType.STUDENT_ENROLLED, {"n": n}) for n in range(10)]
+
+    def pending():
+        return [event.data["n"] for event in bus.event_queue]
+
+    try:
+        with caplog.at_level(logging.WARNING, logger="nexus.event_bus"):
+            for event in events[:3]:
+                bus.publish(event)
+            assert not caplog.records
+
+            bus.publish(events[3])
+            assert pending() == [1, 2, 3]
+            bus.publish_many(events[4:6])
+            assert pending() == [3, 4, 5]
+            # A batch larger than the whole queue pushes out every queued event and its own oldest entries
+            bus.publish_many(events[6:10])
+            assert pending() == [7, 8, 9]
+
+        dropped = [record.getMessage() for record in caplog.records]
+        assert len(dropped) == 3
+        assert "dropping 1 oldest" in dropped[0]
+        assert "dropping 2 oldest" in dropped[1]
+        assert "dropping 4 oldest" in dropped[2]
+    finally:
+        bus._executor.shutdown()
+
+
+def test_cached_bodies_follow_provider_options(main_mod):
+    admin = main_mod.AdminService(port=0)
+    client = admin.app.test_client()
+    compact = {path: client.get(path).data for path in ("/courses", "/ui")}
+
+    admin.app.json.sort_keys = True
+    admin.app.json.compact = False
+    for path, body in compact.items():
+        indented = client.get(path).data
+        assert indented != body and indented.startswith(b"{\n  "), path